@@ -1,10 +1,17 @@
 
 
 const express = require('express');
-const fileUpload = require('express-fileupload');
 const fs = require('fs');
 const path = require('path');
+const https = require('https');
+const crypto = require('crypto');
+const { Readable, pipeline } = require('stream');
 const cors = require('cors');
+const compression = require('compression');
+const Redis = require('ioredis');
+const { LRUCache } = require('lru-cache');
+const Ajv = require('ajv');
+const fjs = require('fast-json-stringify');
 require('dotenv').config();
 
 // IBM SDKs
@@ -13,30 +20,298 @@ const TextToSpeechV1 = require('ibm-watson/text-to-speech/v1');
 const LanguageTranslatorV3 = require('ibm-watson/language-translator/v3');
 
 const app = express();
+// Latency here is dominated by Watson round trips, not routing; just skip per-response work the API doesn't use.
+app.disable('x-powered-by');
+app.set('etag', false); // POST responses are never revalidated; express.static keeps its own ETags
 app.use(cors());
-app.use(express.json({ limit: '2mb' }));
-app.use(fileUpload());
+// gzip/br for JSON and text; audio is already compressed, so it is passed through untouched.
+app.use(compression({
+  threshold: 512,
+  filter: (req, res) => {
+    if (String(res.getHeader('Content-Type') || '').startsWith('audio/')) return false;
+    return compression.filter(req, res);
+  },
+}));
+
+// ---------- Schemas ----------
+// Compiled once at startup: Ajv validators for request bodies, fast-json-stringify serializers for hot responses.
+const ajv = new Ajv();
+// JSON Schema lengths count characters; IBM's request limit counts UTF-8 bytes (Telugu/Hindi are ~3 bytes per char).
+ajv.addKeyword({
+  keyword: 'maxBytes',
+  type: 'string',
+  schemaType: 'number',
+  validate: (max, data) => Buffer.byteLength(data) <= max,
+});
+const TRANSLATE_MAX_BYTES = 40 * 1024; // per IBM call; IBM rejects request bodies over 50KB
+const LANG_CODE = { type: 'string', pattern: '^[a-z]{2,3}(-[A-Za-z]{2,4})?$' };
+const TRANSLATE_TEXT = { type: 'string', minLength: 1, maxLength: 20000, maxBytes: TRANSLATE_MAX_BYTES };
+
+const validateTranslate = ajv.compile({
+  type: 'object',
+  required: ['text', 'source', 'target'],
+  properties: { text: TRANSLATE_TEXT, source: LANG_CODE, target: LANG_CODE },
+});
+const validateTranslateBatch = ajv.compile({
+  type: 'object',
+  required: ['texts', 'source', 'target'],
+  properties: {
+    texts: { type: 'array', minItems: 1, maxItems: 256, items: TRANSLATE_TEXT },
+    source: LANG_CODE,
+    target: LANG_CODE,
+  },
+});
+const validateTts = ajv.compile({
+  type: 'object',
+  required: ['text'],
+  properties: {
+    text: { type: 'string', pattern: '\\S' },
+    voice: { type: 'string', minLength: 1 },
+    accept: { type: 'string', pattern: '^audio/' },
+  },
+});
+const validateQa = ajv.compile({
+  type: 'object',
+  required: ['question'],
+  properties: { question: { type: 'string', minLength: 1 }, context: { type: 'string' } },
+});
+
+// Turns the first Ajv error into a short client-facing message, e.g. "Missing text" or "Invalid accept: must match ...".
+// `field` is the endpoint's main required input; any problem with it reads as "Missing <field>".
+function describeValidationError([err], field) {
+  if (err.keyword === 'required' || err.instancePath === `/${field}`) return `Missing ${field}`;
+  return `Invalid ${err.instancePath.slice(1) || 'body'}: ${err.message}`;
+}
+
+const stringifyTranslation = fjs({
+  type: 'object',
+  properties: { translation: { type: 'string' }, cached: { type: 'boolean' } },
+  required: ['translation'],
+});
+const stringifyTranslations = fjs({
+  type: 'object',
+  properties: { translations: { type: 'array', items: { type: 'string' } } },
+  required: ['translations'],
+});
+
+// ---------- Caches ----------
+// Redis is optional: without REDIS_URL (or while it is unreachable or unresponsive) we fall back to the in-process LRU only.
+// commandTimeout turns a connected-but-hung Redis into a fast error that cacheGet/cacheSet already swallow.
+const redis = process.env.REDIS_URL
+  ? new Redis(process.env.REDIS_URL, { maxRetriesPerRequest: 1, enableOfflineQueue: false, commandTimeout: 100 })
+  : null;
+if (redis) redis.on('error', err => console.error('Redis error', err.message));
+
+const TRANSLATE_TTL_S = 14 * 24 * 60 * 60;
+const translateLru = new LRUCache({ max: 5000, ttl: TRANSLATE_TTL_S * 1000 });
+
+async function cacheGet(lru, key) {
+  const hit = lru.get(key);
+  if (hit !== undefined) return hit;
+  if (!redis) return undefined;
+  try {
+    const value = await redis.get(key);
+    if (value === null) return undefined;
+    lru.set(key, value);
+    return value;
+  } catch (err) {
+    console.warn('Redis get failed', err.message);
+    return undefined;
+  }
+}
+
+async function cacheSet(lru, key, value, ttlSeconds) {
+  lru.set(key, value);
+  if (!redis) return;
+  try {
+    await redis.set(key, value, 'EX', ttlSeconds);
+  } catch (err) {
+    console.warn('Redis set failed', err.message);
+  }
+}
+
+// Concurrent requests for the same key share one upstream call instead of each hitting Watson.
+const inflight = new Map();
+
+function singleFlight(key, fn) {
+  let pending = inflight.get(key);
+  if (!pending) {
+    pending = fn().finally(() => inflight.delete(key));
+    inflight.set(key, pending);
+  }
+  return pending;
+}
+
+function withTimeout(promise, ms) {
+  let timer;
+  const timeout = new Promise((resolve, reject) => {
+    timer = setTimeout(() => reject(new Error(`Timed out after ${ms}ms`)), ms);
+  });
+  return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+}
+
+// Synthesized audio is content-addressed on disk; the LRU below indexes it (key -> bytes) and unlinks on eviction.
+const TTS_CACHE_DIR = process.env.TTS_CACHE_DIR || path.join(__dirname, '.cache', 'tts');
+const TTS_CACHE_MAX_BYTES = 500 * 1024 * 1024;
+fs.mkdirSync(TTS_CACHE_DIR, { recursive: true });
+
+// Upstream-only bounds, so a stuck Watson call can't pin its inflight entry (and agent socket) forever:
+// how long synthesize may take to start answering, and how long its audio stream may go silent.
+// Neither depends on how fast the client downloads.
+const TTS_TIMEOUT_MS = 2 * 60 * 1000;
+const TTS_IDLE_TIMEOUT_MS = 30 * 1000;
+
+const ttsCachePath = key => path.join(TTS_CACHE_DIR, `${key}.bin`);
+
+const ttsFiles = new LRUCache({
+  maxSize: TTS_CACHE_MAX_BYTES,
+  sizeCalculation: size => size || 1,
+  dispose: (size, key, reason) => {
+    if (reason !== 'set') fs.unlink(ttsCachePath(key), () => {});
+  },
+});
+
+// Re-index files left by a previous run, oldest first so the newest end up most recently used.
+// Temp files are leftovers from writes interrupted by a crash and are never renamed into place.
+const cacheEntries = fs.readdirSync(TTS_CACHE_DIR);
+cacheEntries
+  .filter(name => name.endsWith('.tmp'))
+  .forEach(name => fs.unlink(path.join(TTS_CACHE_DIR, name), () => {}));
+cacheEntries
+  .filter(name => name.endsWith('.bin'))
+  .map(name => ({ key: name.slice(0, -4), stat: fs.statSync(path.join(TTS_CACHE_DIR, name)) }))
+  .sort((a, b) => a.stat.mtimeMs - b.stat.mtimeMs)
+  .forEach(({ key, stat }) => ttsFiles.set(key, stat.size));
+
+// Opens an indexed cache file; a file that vanished behind the index's back is dropped so the caller re-synthesizes.
+// Other open failures (e.g. EMFILE under load) are transient: skip the cache for this request but keep the entry.
+async function openTtsCache(key) {
+  if (ttsFiles.get(key) === undefined) return null;
+  try {
+    return await fs.promises.open(ttsCachePath(key), 'r');
+  } catch (err) {
+    if (err.code === 'ENOENT') ttsFiles.delete(key);
+    else console.warn('TTS cache open failed', err.message);
+    return null;
+  }
+}
+
+async function writeTtsCache(key, audio) {
+  const file = ttsCachePath(key);
+  const tmp = `${file}.${crypto.randomBytes(4).toString('hex')}.tmp`;
+  try {
+    await fs.promises.writeFile(tmp, audio);
+    await fs.promises.rename(tmp, file);
+    ttsFiles.set(key, audio.length);
+  } catch (err) {
+    console.warn('TTS cache write failed', err.message);
+    fs.unlink(tmp, () => {});
+  }
+}
+
+// Reads the upstream audio at its own pace, buffering every chunk and handing it to `onChunk`.
+// Nothing downstream can pause it, so a slow client never holds up joiners or the cache write.
+function drainAudio(audio, onChunk) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    let timer;
+    const arm = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => audio.destroy(new Error('TTS upstream stalled')), TTS_IDLE_TIMEOUT_MS);
+    };
+    arm();
+    audio.on('data', chunk => {
+      arm();
+      chunks.push(chunk);
+      onChunk(chunk);
+    });
+    audio.on('end', () => {
+      clearTimeout(timer);
+      resolve(Buffer.concat(chunks));
+    });
+    audio.on('error', err => {
+      clearTimeout(timer);
+      reject(err);
+    });
+  });
+}
+
+// ---------- Shared HTTPS agent ----------
+// The SDK hands extra options to axios; a keep-alive agent reuses TLS connections to Watson across requests.
+const watsonAgent = new https.Agent({ keepAlive: true, keepAliveMsecs: 30000, maxSockets: 64, maxFreeSockets: 32 });
 
 // ---------- IBM Text to Speech ----------
+// Opus is ~3-4x smaller than IBM's default MP3 at similar speech quality; callers can still ask for audio/mp3.
+const DEFAULT_TTS_FORMAT = 'audio/ogg;codecs=opus;rate=24000';
+const AUDIO_EXTENSIONS = { 'audio/ogg': 'ogg', 'audio/mp3': 'mp3', 'audio/mpeg': 'mp3', 'audio/wav': 'wav', 'audio/webm': 'webm', 'audio/flac': 'flac' };
+const audioExtension = accept => AUDIO_EXTENSIONS[accept.split(';')[0].trim()] || 'bin';
+
 const tts = new TextToSpeechV1({
   authenticator: new IamAuthenticator({ apikey: process.env.TTS_API_KEY }),
   serviceUrl: process.env.TTS_URL,
+  httpsAgent: watsonAgent,
 });
 
-app.post('/api/tts', async (req, res) => {
+// JSON bodies are parsed per route so each endpoint gets a limit sized to what it actually accepts.
+app.post('/api/tts', express.json({ limit: '1mb' }), async (req, res) => {
   try {
-    const { text, voice = 'en-US_AllisonV3Voice', accept = 'audio/mp3' } = req.body || {};
-    if (!text || !text.trim()) return res.status(400).json({ error: 'Missing text' });
-
-    const { result } = await tts.synthesize({ text, voice, accept });
-    const repaired = await tts.repairWavHeaderStream(result);
+    if (!validateTts(req.body)) return res.status(400).json({ error: describeValidationError(validateTts.errors, 'text') });
+    const { text, voice = 'en-US_AllisonV3Voice', accept = DEFAULT_TTS_FORMAT } = req.body;
 
-    res.set({
+    const key = crypto.createHash('sha256').update(`${voice}|${accept}|${text}`).digest('hex');
+    const headers = {
       'Content-Type': accept,
-      'Content-Disposition': 'inline; filename="speech.mp3"',
-      'Cache-Control': 'no-store',
+      'Content-Disposition': `inline; filename="speech.${audioExtension(accept)}"`,
+      'Cache-Control': 'public, max-age=86400',
+    };
+    const cachedFile = await openTtsCache(key);
+    if (cachedFile) {
+      res.set(headers);
+      // pipeline closes the file if the client aborts, which a bare .pipe() would not.
+      return pipeline(cachedFile.createReadStream(), res, err => {
+        if (err && err.code !== 'ERR_STREAM_PREMATURE_CLOSE') console.warn('TTS cache read failed', err.message);
+      });
+    }
+
+    const pending = inflight.get(key);
+    if (pending) {
+      const buffered = await pending;
+      res.set(headers);
+      return res.send(buffered);
+    }
+
+    // Only WAV needs its header patched, which means buffering; every other format streams straight through.
+    const synth = withTimeout(
+      tts.synthesize({ text, voice, accept }).then(async ({ result }) =>
+        accept.startsWith('audio/wav') ? Readable.from([await tts.repairWavHeaderStream(result)]) : result
+      ),
+      TTS_TIMEOUT_MS
+    );
+    // This request gets each chunk as it arrives; res buffers whatever the client hasn't taken yet instead of
+    // pausing the upstream. Requests that join meanwhile get the complete buffer, which is also cached.
+    const streamed = synth.then(audio => {
+      res.set(headers);
+      res.flushHeaders();
+      return drainAudio(audio, chunk => {
+        if (!res.destroyed) res.write(chunk);
+      });
     });
-    res.send(repaired);
+    const shared = singleFlight(key, () =>
+      streamed.then(async buffered => {
+        await writeTtsCache(key, buffered);
+        return buffered;
+      })
+    );
+    shared.catch(() => {}); // failures surface through `streamed` here and through `pending` for joiners
+
+    try {
+      await streamed;
+    } catch (err) {
+      if (!res.headersSent) throw err;
+      console.error('TTS stream error', err);
+      return res.destroy(err);
+    }
+    res.end();
   } catch (err) {
     console.error('TTS error', err);
     res.status(500).json({ error: 'TTS failed', details: err?.message });
@@ -48,21 +323,79 @@ const translator = new LanguageTranslatorV3({
   version: '2023-10-24',
   authenticator: new IamAuthenticator({ apikey: process.env.LT_API_KEY }),
   serviceUrl: process.env.LT_URL,
+  httpsAgent: watsonAgent,
 });
 
-app.post('/api/translate', async (req, res) => {
+// Lookups for the same language pair are micro-batched into one IBM call (IBM accepts `text: [...]`).
+// Validation caps each text at TRANSLATE_MAX_BYTES, so flushing before that total is crossed keeps every call under it.
+const TRANSLATE_BATCH_MS = 20;
+const TRANSLATE_BATCH_MAX = 32;
+const translateBatches = new Map();
+
+function enqueueTranslation(text, source, target) {
+  const pair = `${source}:${target}`;
+  const bytes = Buffer.byteLength(text);
+  let batch = translateBatches.get(pair);
+  if (batch && batch.bytes + bytes > TRANSLATE_MAX_BYTES) {
+    flushTranslations(pair);
+    batch = undefined;
+  }
+  if (!batch) {
+    batch = { source, target, items: [], bytes: 0, timer: setTimeout(() => flushTranslations(pair), TRANSLATE_BATCH_MS) };
+    translateBatches.set(pair, batch);
+  }
+  return new Promise((resolve, reject) => {
+    batch.items.push({ text, resolve, reject });
+    batch.bytes += bytes;
+    if (batch.items.length >= TRANSLATE_BATCH_MAX) flushTranslations(pair);
+  });
+}
+
+async function flushTranslations(pair) {
+  const batch = translateBatches.get(pair);
+  if (!batch) return;
+  translateBatches.delete(pair);
+  clearTimeout(batch.timer);
   try {
-    const { text, source, target } = req.body || {};
-    if (!text || !source || !target) {
-      return res.status(400).json({ error: 'Provide text, source, target (e.g., en→te, hi→en, te→en)' });
-    }
     const { result } = await translator.translate({
-      text: [text],
-      source,
-      target,
+      text: batch.items.map(item => item.text),
+      source: batch.source,
+      target: batch.target,
     });
-    const translation = result?.translations?.[0]?.translation || '';
-    res.json({ translation });
+    batch.items.forEach((item, i) => item.resolve(result?.translations?.[i]?.translation || ''));
+  } catch (err) {
+    batch.items.forEach(item => item.reject(err));
+  }
+}
+
+async function translateCached(text, source, target) {
+  const hash = crypto.createHash('md5').update(`${source}:${target}:${text}`).digest('hex');
+  const key = `xlate:v1:${hash}`;
+  const cached = await cacheGet(translateLru, key);
+  if (cached !== undefined) return { translation: cached, cached: true };
+
+  const translation = await singleFlight(key, async () => {
+    const translated = await enqueueTranslation(text, source, target);
+    if (translated) await cacheSet(translateLru, key, translated, TRANSLATE_TTL_S);
+    return translated;
+  });
+  return { translation, cached: false };
+}
+
+// Accepts either { text } or { texts: [...] } alongside source/target.
+app.post('/api/translate', express.json({ limit: '256kb' }), async (req, res) => {
+  try {
+    const isBatch = Array.isArray(req.body?.texts);
+    if (!(isBatch ? validateTranslateBatch : validateTranslate)(req.body)) {
+      return res.status(400).json({ error: 'Provide text (or texts), source, target (e.g., en→te, hi→en, te→en)' });
+    }
+    const { text, texts, source, target } = req.body;
+    if (isBatch) {
+      const results = await Promise.all(texts.map(t => translateCached(t, source, target)));
+      return res.type('application/json').send(stringifyTranslations({ translations: results.map(r => r.translation) }));
+    }
+    const { translation, cached } = await translateCached(text, source, target);
+    res.type('application/json').send(stringifyTranslation(cached ? { translation, cached } : { translation }));
   } catch (err) {
     console.error('Translate error', err);
     res.status(500).json({ error: 'Translation failed', details: err?.message });
@@ -74,16 +407,32 @@ app.post('/api/translate', async (req, res) => {
 // 1) Watson Assistant v2 (dialog skill)
 // 2) watsonx.ai text-generation (e.g., Granite models) with grounding
 // For brevity, we echo a helpful message and return a TODO.
-app.post('/api/qa', async (req, res) => {
-  const { question, context } = req.body || {};
-  if (!question) return res.status(400).json({ error: 'Missing question' });
-  // TODO: Replace with watsonx.ai or Watson Assistant integration.
-  const canned = `Q: ${question}\n\n(Context-aware answers go here. Hook this endpoint to watsonx.ai or Watson Assistant.)`;
-  res.json({ answer: canned });
+// TODO: Replace with watsonx.ai or Watson Assistant integration.
+async function answerQuestion(question, context) {
+  return `Q: ${question}\n\n(Context-aware answers go here. Hook this endpoint to watsonx.ai or Watson Assistant.)`;
+}
+
+// Answers are deliberately not cached yet: the stub echoes the asker's raw question, so a shared cache would hand
+// one user's text to another. Add caching alongside the real watsonx.ai integration, keyed by its backend + model.
+app.post('/api/qa', express.json({ limit: '16kb' }), async (req, res) => {
+  try {
+    if (!validateQa(req.body)) return res.status(400).json({ error: describeValidationError(validateQa.errors, 'question') });
+    const { question, context = '' } = req.body;
+    res.json({ answer: await answerQuestion(question, context) });
+  } catch (err) {
+    console.error('Q&A error', err);
+    res.status(500).json({ error: 'Q&A failed', details: err?.message });
+  }
 });
 
 // ---------- Static hosting (optional) ----------
-app.use(express.static(path.join(__dirname, 'public')));
+// In production serve public/ from nginx or a CDN (see nginx.conf) and set SERVE_STATIC=false so Node only handles /api/*.
+if (process.env.SERVE_STATIC !== 'false') {
+  const publicDir = path.join(__dirname, 'public');
+  // Same policy as nginx.conf: only Vite's content-hashed assets/ are pinned; index.html, favicon, manifest etc. revalidate.
+  app.use('/assets', express.static(path.join(publicDir, 'assets'), { maxAge: '1y', immutable: true }));
+  app.use(express.static(publicDir, { setHeaders: res => res.setHeader('Cache-Control', 'no-cache') }));
+}
 
 const PORT = process.env.PORT || 3001;
 app.listen(PORT, () => console.log(`API running on http://localhost:${PORT}`));
@@ -95,18 +444,36 @@ TTS_API_KEY=YOUR_IBM_TTS_API_KEY
 TTS_URL=YOUR_IBM_TTS_URL              # e.g. https://api.us-south.text-to-speech.watson.cloud.ibm.com
 LT_API_KEY=YOUR_IBM_LT_API_KEY
 LT_URL=YOUR_IBM_LT_URL                # e.g. https://api.us-south.language-translator.watson.cloud.ibm.com
+# Optional shared cache (falls back to in-memory only when unset):
+# REDIS_URL=redis://localhost:6379
+# TTS_CACHE_DIR=./.cache/tts          # synthesized audio cache (bounded to 500MB; default shown)
+# SERVE_STATIC=false                  # when nginx/a CDN serves public/ (see nginx.conf)
 # Optional for Q&A if you wire it up later:
-WATSONX_API_KEY=...
-WATSONX_URL=...
-ASSISTANT_API_KEY=...
-ASSISTANT_URL=...
-ASSISTANT_ID=...
+# WATSONX_API_KEY=...
+# WATSONX_URL=...
+# ASSISTANT_API_KEY=...
+# ASSISTANT_URL=...
+# ASSISTANT_ID=...
 */
 
 // =============================
 // File: App.jsx  (React UI)
 // =============================
-import React, { useMemo, useRef, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
+
+// Static UI data lives at module level so renders don't reallocate it.
+const TABS = Object.freeze([
+  { id:'qa', label:'Q&A' },
+  { id:'translate', label:'Translate' },
+  { id:'tts', label:'Narrate' },
+]);
+
+const OPTIONS = Object.freeze([
+  { id:'en-te', label:'English → Telugu', source:'en', target:'te' },
+  { id:'hi-en', label:'Hindi → English', source:'hi', target:'en' },
+  { id:'te-en', label:'Telugu → English', source:'te', target:'en' },
+]);
+const OPTIONS_BY_ID = new Map(OPTIONS.map(o=>[o.id,o]));
 
 export default function App() {
   const [tab, setTab] = useState('qa');
@@ -117,11 +484,11 @@ export default function App() {
         <h1 className="text-2xl font-bold">Watson-Powered Studio</h1>
         <p className="text-sm text-white/70">Q&A • Translation (EN ↔ HI ↔ TE) • High-Quality Voice Narration</p>
         <nav className="mt-4 flex gap-2">
-          {['qa','translate','tts'].map(id => (
+          {TABS.map(({ id, label }) => (
             <button key={id}
               onClick={() => setTab(id)}
               className={`px-4 py-2 rounded-2xl border ${tab===id? 'bg-white text-black':'border-white/20 hover:bg-white/10'}`}
-            >{id === 'qa' ? 'Q&A' : id === 'translate' ? 'Translate' : 'Narrate'}</button>
+            >{label}</button>
           ))}
         </nav>
       </header>
@@ -177,13 +544,7 @@ function Translate(){
   const [out, setOut] = useState('');
   const [loading, setLoading] = useState(false);
 
-  const options = [
-    { id:'en-te', label:'English → Telugu', source:'en', target:'te' },
-    { id:'hi-en', label:'Hindi → English', source:'hi', target:'en' },
-    { id:'te-en', label:'Telugu → English', source:'te', target:'en' },
-  ];
-
-  const choice = useMemo(()=> options.find(o=>o.id===mode), [mode]);
+  const choice = OPTIONS_BY_ID.get(mode);
 
   const run = async () => {
     setLoading(true); setOut('');
@@ -198,7 +559,7 @@ function Translate(){
   return (
     <section className="grid gap-3">
       <div className="flex flex-wrap gap-2">
-        {options.map(o=> (
+        {OPTIONS.map(o=> (
           <button key={o.id} className={`px-3 py-2 rounded-2xl border ${mode===o.id? 'bg-white text-black':'border-white/20 hover:bg-white/10'}`} onClick={()=>setMode(o.id)}>{o.label}</button>
         ))}
       </div>
@@ -213,25 +574,77 @@ function Translate(){
   );
 }
 
+// Per UI format: what to request when MediaSource can play it while downloading (WebM is the Opus container
+// Chrome/Firefox MSE accept), and what to request for plain blob playback otherwise.
+const TTS_FORMATS = {
+  opus: {
+    mse: { accept: 'audio/webm;codecs=opus', type: 'audio/webm; codecs="opus"', ext: 'webm' },
+    blob: { accept: 'audio/ogg;codecs=opus;rate=24000', ext: 'ogg' },
+  },
+  mp3: {
+    mse: { accept: 'audio/mp3', type: 'audio/mpeg', ext: 'mp3' },
+    blob: { accept: 'audio/mp3', ext: 'mp3' },
+  },
+};
+
+// Appends response chunks to a SourceBuffer as they arrive so playback starts with the first chunk
+// instead of after the whole clip has downloaded. Resolves with the complete clip for the download link.
+async function streamIntoAudio(body, audio, type, trackUrl){
+  const ms = new MediaSource();
+  const msUrl = URL.createObjectURL(ms);
+  trackUrl(msUrl);
+  audio.src = msUrl;
+  await new Promise(r=>ms.addEventListener('sourceopen', r, { once:true }));
+
+  const sb = ms.addSourceBuffer(type);
+  const reader = body.getReader();
+  const chunks = [];
+  while(true){
+    const { value, done } = await reader.read();
+    if(done){ ms.endOfStream(); break; }
+    chunks.push(value);
+    await new Promise(r=>{ sb.addEventListener('updateend', r, { once:true }); sb.appendBuffer(value); });
+    if(chunks.length === 1) audio.play();
+  }
+  return new Blob(chunks, { type });
+}
+
 function Narrate(){
   const [text, setText] = useState('Welcome to the Watson-powered narrator!');
   const [voice, setVoice] = useState('en-US_AllisonV3Voice');
+  const [format, setFormat] = useState('opus'); // MP3 stays available for browsers without Opus support (older Safari)
   const [loading, setLoading] = useState(false);
   const audioRef = useRef(null);
+  const urls = useRef([]); // object URLs backing the player + download link; revoked when replaced
+
+  const releaseUrls = () => { urls.current.forEach(u=>URL.revokeObjectURL(u)); urls.current = []; };
+  const trackUrl = u => { urls.current.push(u); };
+
+  useEffect(()=>releaseUrls,[]);
 
   const speak = async () => {
     setLoading(true);
+    if(urls.current.length){
+      releaseUrls();
+      document.getElementById('tts-download').classList.add('pointer-events-none','opacity-40');
+    }
     try{
-      const res = await fetch('/api/tts', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ text, voice, accept:'audio/mp3' })});
+      const { mse, blob: fallback } = TTS_FORMATS[format];
+      const canStream = !!window.MediaSource && MediaSource.isTypeSupported(mse.type);
+      const { accept, ext } = canStream ? mse : fallback;
+      const res = await fetch('/api/tts', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({ text, voice, accept })});
       if(!res.ok) throw new Error('TTS failed');
-      const blob = await res.blob();
-      const url = URL.createObjectURL(blob);
       const a = audioRef.current;
-      a.src = url; a.play();
+      // Without MSE support for this format (e.g. Safari) we fall back to playing the fully downloaded blob.
+      const streamed = canStream && res.body ? await streamIntoAudio(res.body, a, mse.type, trackUrl) : null;
+      const blob = streamed || await res.blob();
+      const url = URL.createObjectURL(blob);
+      trackUrl(url);
+      if(!streamed){ a.src = url; a.play(); }
 
       // Create a download link dynamically
       const dl = document.getElementById('tts-download');
-      dl.href = url; dl.download = 'narration.mp3';
+      dl.href = url; dl.download = `narration.${ext}`;
       dl.classList.remove('pointer-events-none','opacity-40');
     }catch(err){ alert(err.message); }
     finally{ setLoading(false); }
@@ -250,12 +663,18 @@ function Narrate(){
           {/* Add more supported voices as needed */}
         </select>
 
+        <label className="text-sm text-white/70">Format</label>
+        <select value={format} onChange={e=>setFormat(e.target.value)} className="px-3 py-2 rounded-2xl bg-white/5 border border-white/10">
+          <option value="opus">Opus (smaller)</option>
+          <option value="mp3">MP3 (Safari)</option>
+        </select>
+
         <button onClick={speak} disabled={loading || !text.trim()} className="px-4 py-2 rounded-2xl bg-white text-black disabled:opacity-50">{loading?'Generating…':'Speak'}</button>
-        <a id="tts-download" className="px-4 py-2 rounded-2xl border border-white/20 pointer-events-none opacity-40" href="#">Download MP3</a>
+        <a id="tts-download" className="px-4 py-2 rounded-2xl border border-white/20 pointer-events-none opacity-40" href="#">Download</a>
       </div>
 
       <audio ref={audioRef} controls className="mt-2 w-full" />
-      <p className="text-xs text-white/60">Tip: Generate first, then use the Download MP3 button.</p>
+      <p className="text-xs text-white/60">Tip: Generate first, then use the Download button.</p>
     </section>
   );
 }
@@ -266,7 +685,7 @@ function Narrate(){
 // 1) Save this file as App.jsx and the backend as server.js
 // 2) Backend setup:
 //    npm init -y
-//    npm i express cors express-fileupload dotenv ibm-watson
+//    npm i express cors dotenv ibm-watson ioredis lru-cache compression ajv fast-json-stringify
 //    # create .env (see keys above)
 //    node server.js  # runs on http://localhost:3001
 // 3) Frontend setup (one quick option using Vite):
@@ -278,3 +697,4 @@ function Narrate(){
 //    // vite.config.js -> server: { proxy: { '/api': 'http://localhost:3001' } }
 //    npm run dev
 // 4) Production: host server.js behind HTTPS; never expose IBM keys to the browser.
+//    nginx.conf serves the built UI from public/ and proxies only /api/* to Node.